@@ -9,208 +9,536 @@ This application provides:
 - Web interface for displaying results
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, request
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+import hashlib
+import logging
 import os
 import json
+import pickle
+import threading
 import warnings
-warnings.filterwarnings('ignore')
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 # Try to import ARIMA, but use simple forecast if not available
 try:
+    import statsmodels
     from statsmodels.tsa.arima.model import ARIMA
     ARIMA_AVAILABLE = True
+    # ARIMA fits fall back to zero starting parameters on their own; don't warn about it
+    warnings.filterwarnings('ignore', message='Non-(stationary|invertible) starting', module='statsmodels')
 except ImportError:
     ARIMA_AVAILABLE = False
-    print("Note: statsmodels not available. Using simple trend-based forecasting.")
+    logger.info("statsmodels not available, legacy ARIMA forecasting is disabled")
+
+# Try to import pyarrow for fast CSV parsing, fall back to pandas reader if not available
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pa_compute
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Try to import numba to compile numeric loops, run them as plain Python if not available
+try:
+    from numba import njit
+except ImportError:
+    logger.info("numba not available, forecasting kernels run as plain Python")
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Try to import msgpack for binary forecast responses, serve JSON only if not available
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Try to import orjson for fast JSON responses, fall back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 app = Flask(__name__)
 
 # Configuration
 DATA_FILE = 'data/city_day.csv'  # Using Kaggle city_day.csv dataset
 UPLOAD_FOLDER = 'data'
+MODEL_CACHE_FOLDER = 'cache'  # Fitted ARIMA models, keyed by the series they were fitted on
+# Layout of the preprocessed dataset saved as Parquet; bump it whenever
+# preprocess_dataset changes its output so files written by older code are not reused
+PARQUET_FORMAT_VERSION = 1
+# ARIMA orders tried in turn by the statsmodels model, falling back to simpler ones
+ARIMA_ORDERS = ((1, 1, 1), (1, 0, 1), (1, 0, 0))
+AR_ORDER = 1  # AR lags of the least-squares ARIMA(p,1,q) forecast model
+MA_ORDER = 1  # MA lags (0 or 1) of the least-squares ARIMA(p,1,q) forecast model
+MAX_FORECAST_DAYS = 365  # Longest forecast the API accepts
+# Use the statsmodels ARIMA model instead of the least-squares fit (for comparing results)
+USE_ARIMA_LEGACY = os.environ.get('USE_ARIMA_LEGACY', '0') == '1'
 
 # Ensure data directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # Cache for loaded dataset (to avoid reloading on every request)
 _data_cache = None
+_data_cache_mtime = None
+
+# Daily and monthly AQI per city as (dates, aqi_values) arrays, built once per
+# dataset load. Keys are normalized city names, None for all cities.
+DAILY_BY_CITY = {}
+MONTHLY_BY_CITY = {}
+
+# Fitted ARIMA models by series hash for the loaded dataset, cleared when it is
+# reloaded (their parameters are also pickled to MODEL_CACHE_FOLDER)
+_arima_model_cache = {}
+
+# Background thread compiling kernels and fitting models at startup
+_warm_up_thread = None
+
+# Columns of city_day.csv actually used by the application, with their internal names
+CITY_DAY_SCHEMA = {'Date': 'date', 'City': 'city', 'AQI': 'aqi'}
+CITY_DAY_COLUMNS = list(CITY_DAY_SCHEMA)
+
+
+def read_city_day_arrow(file_path):
+    """
+    Read city_day.csv with the pyarrow CSV parser, loading only the
+    Date, City and AQI columns with their final types.
+    Returns None if pyarrow is not available or the file has a different schema
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    
+    try:
+        table = pa_csv.read_csv(
+            file_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=CITY_DAY_COLUMNS,
+                column_types={
+                    'Date': pa.string(),
+                    'City': pa.dictionary(pa.int32(), pa.string()),
+                    'AQI': pa.float32()
+                }
+            )
+        )
+    except (pa.ArrowInvalid, KeyError) as e:
+        logger.info("Fast CSV reader unavailable for this file (%s), using pandas reader", e)
+        return None
+    
+    # Parse dates in Arrow; malformed dates become null and are dropped later
+    dates = pa_compute.strptime(table['Date'], format='%Y-%m-%d', unit='ns', error_is_null=True)
+    table = table.set_column(table.schema.get_field_index('Date'), 'Date', dates)
+    
+    return table.to_pandas()
+
+
+def read_city_day_pandas(file_path):
+    """
+    Read the Date, City and AQI columns of city_day.csv with pandas
+    Returns None if the file has a different schema
+    """
+    try:
+        df = pd.read_csv(file_path, usecols=CITY_DAY_COLUMNS, dtype={'City': 'category', 'AQI': 'float32'})
+    except ValueError as e:
+        logger.info("File does not match the city_day.csv schema (%s), detecting columns", e)
+        return None
+    
+    # Malformed dates become NaT and are dropped later
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
+    return df
+
+
+def load_with_column_detection(file_path):
+    """
+    Load a CSV file of unknown layout with pandas and detect the
+    date, city and AQI columns by name
+    """
+    # Load the dataset
+    df = pd.read_csv(file_path)
+    
+    # Display column names for debugging
+    logger.info("Columns in dataset: %s", df.columns.tolist())
+    
+    # Identify date column (common variations for city_day.csv)
+    date_col = None
+    for col in df.columns:
+        if 'date' in col.lower():
+            date_col = col
+            break
+    
+    # If no date column found, assume first column is date
+    if date_col is None:
+        date_col = df.columns[0]
+    
+    # Convert date column to datetime
+    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    
+    # Handle missing values in date column
+    df = df.dropna(subset=[date_col])
+    
+    # Identify City column
+    city_col = None
+    for col in df.columns:
+        if 'city' in col.lower():
+            city_col = col
+            break
+    
+    # Identify AQI column
+    aqi_col = None
+    for col in df.columns:
+        if 'aqi' in col.lower() and 'bucket' not in col.lower():
+            aqi_col = col
+            break
+    
+    # If no AQI column found, look for numeric columns
+    if aqi_col is None:
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) > 0:
+            aqi_col = numeric_cols[0]
+    
+    # Rename columns for easier handling
+    rename_dict = {date_col: 'date', aqi_col: 'aqi'}
+    if city_col:
+        rename_dict[city_col] = 'city'
+    
+    df = df.rename(columns=rename_dict)
+    
+    # Ensure city column exists (if not, create a default)
+    if 'city' not in df.columns:
+        df['city'] = 'All Cities'
+    
+    # Ensure AQI values are numeric
+    df['aqi'] = pd.to_numeric(df['aqi'], errors='coerce')
+    
+    return df
+
+
+def get_parquet_path(file_path):
+    """Path of the Parquet copy of the preprocessed dataset for a CSV file"""
+    return f'{os.path.splitext(file_path)[0]}.v{PARQUET_FORMAT_VERSION}.parquet'
+
+
+def read_parquet_cache(parquet_path, mtime):
+    """
+    Read the preprocessed dataset from its Parquet copy
+    Returns None if there is no usable copy that is newer than the data file
+    """
+    if not PYARROW_AVAILABLE or mtime is None:
+        return None
+    
+    parquet_mtime = get_data_mtime(parquet_path)
+    if parquet_mtime is None or parquet_mtime < mtime:
+        return None
+    
+    try:
+        return pd.read_parquet(parquet_path, engine='pyarrow')
+    except Exception as e:
+        logger.warning("Could not read Parquet cache %s (%s), rebuilding it from the CSV", parquet_path, e)
+        return None
+
+
+def write_parquet_cache(df, parquet_path):
+    """Save the preprocessed dataset as Parquet for faster loading on next start"""
+    if not PYARROW_AVAILABLE:
+        return
+    
+    # Write to a temporary file first so readers never see a partial file
+    tmp_path = f'{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+        os.replace(tmp_path, parquet_path)
+    except (OSError, ValueError, pa.ArrowException) as e:
+        logger.warning("Could not write Parquet cache %s: %s", parquet_path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def get_data_mtime(file_path):
+    """Modification time of the data file, used to invalidate cached results"""
+    try:
+        return os.path.getmtime(file_path)
+    except OSError:
+        return None
 
 
 def load_full_dataset(file_path):
     """
     Load the full city_day.csv dataset (with caching)
-    Returns the complete dataset with all cities
+    Returns the complete dataset with all cities, indexed by (city, date)
+    
+    The preprocessed dataset is also written to a Parquet file next to the CSV,
+    which is read instead of the CSV on later starts while it is up to date.
     """
-    global _data_cache
+    global _data_cache, _data_cache_mtime, DAILY_BY_CITY, MONTHLY_BY_CITY
     
-    # Return cached data if available
-    if _data_cache is not None:
+    mtime = get_data_mtime(file_path)
+    
+    # Return cached data if available and the data file has not changed
+    if _data_cache is not None and _data_cache_mtime == mtime:
         return _data_cache
     
     try:
-        # Load the dataset
-        df = pd.read_csv(file_path)
-        
-        # Display column names for debugging
-        print(f"Columns in dataset: {df.columns.tolist()}")
-        
-        # Identify date column (common variations for city_day.csv)
-        date_col = None
-        for col in df.columns:
-            if 'date' in col.lower():
-                date_col = col
-                break
-        
-        # If no date column found, assume first column is date
-        if date_col is None:
-            date_col = df.columns[0]
-        
-        # Convert date column to datetime
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-        
-        # Handle missing values in date column
-        df = df.dropna(subset=[date_col])
-        
-        # Identify City column
-        city_col = None
-        for col in df.columns:
-            if 'city' in col.lower():
-                city_col = col
-                break
-        
-        # Identify AQI column
-        aqi_col = None
-        for col in df.columns:
-            if 'aqi' in col.lower() and 'bucket' not in col.lower():
-                aqi_col = col
-                break
-        
-        # If no AQI column found, look for numeric columns
-        if aqi_col is None:
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) > 0:
-                aqi_col = numeric_cols[0]
-        
-        # Rename columns for easier handling
-        rename_dict = {date_col: 'date', aqi_col: 'aqi'}
-        if city_col:
-            rename_dict[city_col] = 'city'
-        
-        df = df.rename(columns=rename_dict)
-        
-        # Ensure city column exists (if not, create a default)
-        if 'city' not in df.columns:
-            df['city'] = 'All Cities'
-        
-        # Ensure AQI values are numeric
-        df['aqi'] = pd.to_numeric(df['aqi'], errors='coerce')
-        
-        # Remove rows with missing AQI
-        df = df.dropna(subset=['aqi', 'date'])
+        parquet_path = get_parquet_path(file_path)
+        df = read_parquet_cache(parquet_path, mtime)
+        if df is None:
+            df = preprocess_dataset(file_path)
+            write_parquet_cache(df, parquet_path)
         
-        # Sort by date and city
-        df = df.sort_values(['city', 'date'])
+        # Index by city and date so per-city lookups are a sorted index slice
+        df = df.set_index(['city', 'date']).sort_index()
         
-        # Reset index
-        df = df.reset_index(drop=True)
+        # Precompute the trend series served by the API
+        DAILY_BY_CITY, MONTHLY_BY_CITY = build_city_aggregates(df)
         
-        # Extract date components for grouping
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['day'] = df['date'].dt.day
+        # Models fitted on the previous data no longer match any city series;
+        # the ones still needed are reloaded from MODEL_CACHE_FOLDER
+        _arima_model_cache.clear()
         
         # Cache the data
         _data_cache = df
+        _data_cache_mtime = mtime
         
         return df
     
-    except Exception as e:
-        print(f"Error loading data: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error loading data")
         return None
 
 
-def load_and_preprocess_data(file_path, city=None):
+def preprocess_dataset(file_path):
     """
-    Load CSV data and perform preprocessing for a specific city:
+    Read the CSV file and preprocess all cities at once:
     - Handle missing values
     - Convert date column to datetime
-    - Filter by city (if specified)
-    - Sort by date
+    - Sort by city and date
     - Remove duplicates
     """
+    # Fast path: typed, column-projected read of the known city_day.csv schema
+    df = read_city_day_arrow(file_path)
+    if df is None:
+        df = read_city_day_pandas(file_path)
+    
+    if df is not None:
+        df = df.rename(columns=CITY_DAY_SCHEMA)
+    else:
+        df = load_with_column_detection(file_path)
+    
+    # Remove rows with missing AQI
+    df = df.dropna(subset=['aqi', 'date'])
+    
+    # AQI values (0-500, whole numbers in the source data) fit in float32,
+    # which halves the memory every later aggregation has to read
+    df['aqi'] = df['aqi'].astype(np.float32)
+    
+    # Normalize city names once so requests can match them exactly
+    df['city'] = df['city'].astype(str).str.strip().astype('category')
+    
+    # Sort by date and city
+    df = df.sort_values(['city', 'date'])
+    
+    # Handle missing values in AQI column (forward fill, then backward fill per city)
+    df['aqi'] = df.groupby('city', sort=False, observed=True)['aqi'].transform(lambda s: s.ffill().bfill())
+    
+    # If still missing values, fill with the city mean
+    df['aqi'] = df['aqi'].fillna(df.groupby('city', observed=True)['aqi'].transform('mean'))
+    
+    # Remove duplicates based on city and date
+    df = df.drop_duplicates(subset=['city', 'date'], keep='first')
+    
+    # Reset index
+    df = df.reset_index(drop=True)
+    
+    return df
+
+
+def normalize_city(city):
+    """Normalize a requested city name for filtering and cache lookups"""
+    if not city or city == 'All Cities':
+        return None
+    return city.strip().lower()
+
+
+def load_and_preprocess_data(file_path, city=None):
+    """
+    Get the preprocessed data for a specific city (or all cities).
+    Missing values, date conversion, sorting and duplicate removal are
+    handled once in load_full_dataset, so this only filters by city.
+    
+    Results are cached per city until the data file changes, so the
+    returned DataFrame is shared and must not be modified in place.
+    """
     try:
-        # Load full dataset (uses cache)
-        df = load_full_dataset(file_path)
-        
-        if df is None:
+        return _preprocess_city(file_path, normalize_city(city), get_data_mtime(file_path))
+    except Exception:
+        logger.exception("Error preprocessing data")
+        return None
+
+
+@lru_cache(maxsize=64)
+def _preprocess_city(file_path, city, mtime):
+    """
+    Cached implementation of load_and_preprocess_data (city is normalized)
+    Raises on errors instead of returning None, so failures are not cached
+    """
+    # Load full dataset (uses cache)
+    df = load_full_dataset(file_path)
+    
+    if df is None:
+        raise RuntimeError(f"Failed to load data from {file_path}")
+    
+    # Filter by city if specified
+    if city:
+        city_names = {name.lower(): name for name in df.index.levels[0]}
+        if city not in city_names:
+            logger.info("No data found for city: %s", city)
             return None
-        
-        # Filter by city if specified
-        if city and city != 'All Cities' and 'city' in df.columns:
-            df = df[df['city'].str.strip().str.lower() == city.strip().lower()].copy()
-            if len(df) == 0:
-                print(f"No data found for city: {city}")
-                return None
-        
-        # Handle missing values in AQI column (forward fill, then backward fill per city)
-        if 'city' in df.columns:
-            df['aqi'] = df.groupby('city')['aqi'].ffill().bfill()
-        else:
-            df['aqi'] = df['aqi'].ffill().bfill()
-        
-        # If still missing values, fill with mean
-        df['aqi'] = df['aqi'].fillna(df['aqi'].mean())
-        
-        # Remove duplicates based on date (and city if applicable)
-        if 'city' in df.columns:
-            df = df.drop_duplicates(subset=['city', 'date'], keep='first')
-        else:
-            df = df.drop_duplicates(subset=['date'], keep='first')
-        
-        # Sort by date
-        df = df.sort_values('date')
-        
-        # Reset index
-        df = df.reset_index(drop=True)
-        
-        return df
+        df = df.loc[city_names[city]].reset_index()
+    else:
+        # All cities: order rows by date across cities
+        df = df.reset_index().sort_values('date', kind='stable')
     
-    except Exception as e:
-        print(f"Error preprocessing data: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    # Reset index
+    df = df.reset_index(drop=True)
+    
+    return df
+
+
+def build_city_aggregates(df):
+    """
+    Calculate daily and monthly AQI for every city and for all cities combined
+    Returns two dicts mapping normalized city name to (dates, aqi_values) arrays
+    """
+    def to_arrays(agg_df):
+        return agg_df['date'].values, agg_df['aqi'].to_numpy(np.float32)
+    
+    daily_by_city = {}
+    monthly_by_city = {}
+    
+    for city, city_df in df.groupby(level='city', sort=False, observed=True):
+        city_df = city_df.droplevel('city').reset_index()
+        daily_by_city[normalize_city(city)] = to_arrays(calculate_daily_aqi(city_df))
+        monthly_by_city[normalize_city(city)] = to_arrays(calculate_monthly_aqi(city_df))
+    
+    all_df = df.reset_index()
+    daily_by_city[None] = to_arrays(calculate_daily_aqi(all_df))
+    monthly_by_city[None] = to_arrays(calculate_monthly_aqi(all_df))
+    
+    return daily_by_city, monthly_by_city
+
+
+def get_daily_aqi(file_path, city=None):
+    """Daily average AQI for a city as (dates, aqi_values) arrays"""
+    if load_full_dataset(file_path) is None:
+        return None
+    return DAILY_BY_CITY.get(normalize_city(city))
+
+
+def get_monthly_aqi(file_path, city=None):
+    """Monthly average AQI for a city as (dates, aqi_values) arrays"""
+    if load_full_dataset(file_path) is None:
         return None
+    return MONTHLY_BY_CITY.get(normalize_city(city))
 
 
 def calculate_daily_aqi(df):
     """Calculate daily average AQI"""
-    daily_aqi = df.groupby(df['date'].dt.date)['aqi'].mean().reset_index()
-    daily_aqi.columns = ['date', 'aqi']
-    daily_aqi['date'] = pd.to_datetime(daily_aqi['date'])
+    # Truncate dates to days in numpy, avoiding Python date objects
+    days = df['date'].values.astype('datetime64[D]')
+    aqi_values = df['aqi'].to_numpy(np.float32)
+    
+    if len(days) == 0:
+        return pd.DataFrame({'date': days.astype('datetime64[ns]'), 'aqi': aqi_values})
+    
+    # Readings of the same day must be contiguous (all-cities data is ordered by city)
+    if np.any(days[1:] < days[:-1]):
+        order = np.argsort(days, kind='stable')
+        days = days[order]
+        aqi_values = aqi_values[order]
+    
+    # Sum each run of equal days in one pass and divide by the run lengths
+    boundaries = np.concatenate(([0], np.nonzero(days[1:] != days[:-1])[0] + 1))
+    sums = np.add.reduceat(aqi_values, boundaries, dtype=np.float64)
+    counts = np.diff(np.append(boundaries, len(days)))
+    
+    daily_aqi = pd.DataFrame({
+        'date': days[boundaries].astype('datetime64[ns]'),
+        'aqi': (sums / counts).astype(np.float32)
+    })
     return daily_aqi
 
 
 def calculate_monthly_aqi(df):
     """Calculate monthly average AQI"""
-    # Extract year and month first
-    df_copy = df.copy()
-    df_copy['year'] = df_copy['date'].dt.year
-    df_copy['month'] = df_copy['date'].dt.month
+    # Bin readings into calendar months (month start dates) and average them
+    monthly_aqi = (df.set_index('date')['aqi']
+                     .resample('MS').mean()
+                     .dropna()
+                     .rename_axis('date').reset_index())
+    return monthly_aqi
+
+
+@njit(cache=True)
+def linear_trend_slope(y):
+    """
+    Slope of the least-squares line through y against 0, 1, ..., n-1
+    Closed form of np.polyfit(np.arange(n), y, 1)[0]
+    """
+    n = y.shape[0]
+    center = (n - 1) / 2.0
+    total = 0.0
+    for i in range(n):
+        total += (i - center) * y[i]
+    return total * 12.0 / (n * (n * n - 1.0))
+
+
+@njit(cache=True)
+def simple_forecast_kernel(recent_mean, trend_slope, confidence_range, seasonal, days_of_year):
+    """
+    Compiled loop of forecast_aqi_simple
     
-    # Group by year and month, then calculate mean AQI
-    monthly_aqi = df_copy.groupby(['year', 'month'])['aqi'].mean().reset_index()
+    Parameters:
+    - seasonal: mean AQI per day of year (index 1-366), NaN where unknown
+    - days_of_year: day of year of each forecast date
     
-    # Create date column from year and month
-    monthly_aqi['date'] = pd.to_datetime(monthly_aqi[['year', 'month']].assign(day=1))
+    Returns:
+    - forecast values, lower bounds and upper bounds as arrays
+    """
+    n = days_of_year.shape[0]
+    forecast_values = np.empty(n)
+    lower_bounds = np.empty(n)
+    upper_bounds = np.empty(n)
     
-    # Sort by date and return only date and aqi columns
-    monthly_aqi = monthly_aqi[['date', 'aqi']].sort_values('date').reset_index(drop=True)
-    return monthly_aqi
+    for i in range(n):
+        # Base forecast: recent mean + trend
+        base_forecast = recent_mean + (trend_slope * (i + 1))
+        
+        # Add seasonal adjustment if available
+        seasonal_value = seasonal[days_of_year[i]]
+        if not np.isnan(seasonal_value):
+            base_forecast += (seasonal_value - recent_mean) * 0.3  # Weight seasonal component
+        
+        # Ensure forecast is within reasonable bounds
+        base_forecast = max(0.0, min(500.0, base_forecast))
+        
+        forecast_values[i] = base_forecast
+        lower_bounds[i] = max(0.0, base_forecast - confidence_range)
+        upper_bounds[i] = min(500.0, base_forecast + confidence_range)
+    
+    return forecast_values, lower_bounds, upper_bounds
 
 
 def forecast_aqi_simple(df, forecast_days=30):
@@ -227,7 +555,7 @@ def forecast_aqi_simple(df, forecast_days=30):
     """
     try:
         # Prepare time series data
-        df_ts = df[['date', 'aqi']].copy()
+        df_ts = df[['date', 'aqi']]
         df_ts = df_ts.set_index('date')
         df_ts = df_ts.sort_index()
         
@@ -247,49 +575,29 @@ def forecast_aqi_simple(df, forecast_days=30):
         # Calculate trend (linear regression on last 30 days)
         recent_data = df_ts['aqi'].tail(min(30, len(df_ts)))
         if len(recent_data) > 1:
-            x = np.arange(len(recent_data))
-            y = recent_data.values
             # Simple linear trend
-            trend_slope = np.polyfit(x, y, 1)[0] if len(recent_data) > 1 else 0
+            trend_slope = linear_trend_slope(recent_data.to_numpy(np.float64))
         else:
             trend_slope = 0
         
-        # Calculate seasonal component (if enough data)
+        # Calculate seasonal component (if enough data), indexed by day of year
+        seasonal = np.full(367, np.nan)
         if len(df_ts) >= 365:
             # Use last year's pattern
-            df_ts['day_of_year'] = df_ts.index.dayofyear
-            seasonal_pattern = df_ts.groupby('day_of_year')['aqi'].mean()
-        else:
-            seasonal_pattern = None
+            seasonal_pattern = df_ts['aqi'].groupby(df_ts.index.dayofyear).mean()
+            seasonal[seasonal_pattern.index.values] = seasonal_pattern.values
+        
+        # Calculate confidence intervals (95% confidence)
+        confidence_range = recent_std * 1.96 if not pd.isna(recent_std) else recent_mean * 0.2
         
         # Generate forecast
         last_date = df_ts.index[-1]
         forecast_dates = pd.date_range(start=last_date + timedelta(days=1), periods=forecast_days, freq='D')
         
-        forecast_values = []
-        lower_bounds = []
-        upper_bounds = []
-        
-        for i, forecast_date in enumerate(forecast_dates):
-            # Base forecast: recent mean + trend
-            base_forecast = recent_mean + (trend_slope * (i + 1))
-            
-            # Add seasonal adjustment if available
-            if seasonal_pattern is not None:
-                day_of_year = forecast_date.dayofyear
-                if day_of_year in seasonal_pattern.index:
-                    seasonal_adj = seasonal_pattern[day_of_year] - recent_mean
-                    base_forecast += seasonal_adj * 0.3  # Weight seasonal component
-            
-            # Ensure forecast is within reasonable bounds
-            base_forecast = max(0, min(500, base_forecast))
-            
-            # Calculate confidence intervals (95% confidence)
-            confidence_range = recent_std * 1.96 if not pd.isna(recent_std) else recent_mean * 0.2
-            
-            forecast_values.append(base_forecast)
-            lower_bounds.append(max(0, base_forecast - confidence_range))
-            upper_bounds.append(min(500, base_forecast + confidence_range))
+        forecast_values, lower_bounds, upper_bounds = simple_forecast_kernel(
+            float(recent_mean), float(trend_slope), float(confidence_range),
+            seasonal, forecast_dates.dayofyear.values.astype(np.int64)
+        )
         
         # Create forecast DataFrame
         forecast_df = pd.DataFrame({
@@ -301,17 +609,280 @@ def forecast_aqi_simple(df, forecast_days=30):
         
         return forecast_df, None
         
-    except Exception as e:
-        print(f"Error in forecasting: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in forecasting")
         return None, None
 
 
+@njit(cache=True)
+def arma_forecast_kernel(phi, theta, last_values, last_resid, steps):
+    """
+    Extend a series with the ARMA recursion
+    y_t = phi[0] * y_t-1 + ... + phi[p-1] * y_t-p + theta[0] * e_t-1 + ... + theta[q-1] * e_t-q
+    where future shocks e_t are zero (their expected value)
+    
+    Parameters:
+    - phi: AR lag coefficients
+    - theta: MA lag coefficients
+    - last_values: last p observed values, oldest first
+    - last_resid: last q shocks (residuals), oldest first
+    - steps: number of values to forecast
+    """
+    p = phi.shape[0]
+    q = theta.shape[0]
+    buf = last_values.copy()
+    resid = last_resid.copy()
+    out = np.empty(steps)
+    
+    for t in range(steps):
+        value = 0.0
+        for j in range(p):
+            value += phi[j] * buf[p - 1 - j]
+        for j in range(q):
+            value += theta[j] * resid[q - 1 - j]
+        out[t] = value
+        
+        # Shift the windows of the last p values and q shocks
+        if p > 0:
+            for j in range(p - 1):
+                buf[j] = buf[j + 1]
+            buf[p - 1] = value
+        if q > 0:
+            for j in range(q - 1):
+                resid[j] = resid[j + 1]
+            resid[q - 1] = 0.0
+    
+    return out
+
+
+@njit(cache=True)
+def ma_filter_kernel(y, theta):
+    """
+    Remove an MA(1) component from a series: x_t = y_t - theta * x_t-1, with x_-1 = 0
+    An ARMA(p,1) series filtered this way is an AR(p) series
+    """
+    n = y.shape[0]
+    out = np.empty(n)
+    prev = 0.0
+    
+    for t in range(n):
+        prev = y[t] - theta * prev
+        out[t] = prev
+    
+    return out
+
+
+def fit_arma_css(y, p, q):
+    """
+    Fit an ARMA(p,q) model (q is 0 or 1) without intercept by conditional least squares
+    
+    For a fixed MA coefficient theta the model is an AR(p) model of the series
+    filtered by ma_filter_kernel, so phi is an ordinary least squares fit; theta is
+    the value with the smallest residual sum of squares on a grid over (-1, 1).
+    
+    Returns:
+    - phi: AR lag coefficients (phi[0] is the coefficient of lag 1)
+    - theta: MA lag coefficients
+    - resid: residuals (the estimated shocks), aligned with the end of y
+    - resid_std: standard deviation of the residuals
+    """
+    if q not in (0, 1):
+        raise ValueError("Only MA orders 0 and 1 are supported")
+    if len(y) < 2 * (p + q) + 2:
+        raise ValueError("Not enough data for forecasting")
+    
+    def fit_ar(theta):
+        x = ma_filter_kernel(y, theta) if theta else y
+        
+        # Each row is [x_t, x_t-1, ..., x_t-p]
+        windows = np.lib.stride_tricks.sliding_window_view(x, p + 1)[:, ::-1]
+        target = windows[:, 0]
+        lags = windows[:, 1:]
+        
+        phi = np.linalg.lstsq(lags, target, rcond=None)[0]
+        resid = target - lags @ phi
+        return resid @ resid, phi, resid
+    
+    theta = 0.0
+    if q:
+        # Coarse grid over the invertible range, then a fine grid around the best value
+        coarse = np.linspace(-0.98, 0.98, 99)
+        theta = coarse[np.argmin([fit_ar(t)[0] for t in coarse])]
+        fine = np.clip(np.linspace(theta - 0.02, theta + 0.02, 81), -0.99, 0.99)
+        theta = fine[np.argmin([fit_ar(t)[0] for t in fine])]
+    
+    rss, phi, resid = fit_ar(theta)
+    
+    # Reject explosive fits, whose forecasts diverge
+    if np.any(np.abs(np.roots(np.r_[1.0, -phi])) >= 1):
+        raise ValueError("Fitted model is not stationary")
+    
+    resid_std = np.sqrt(rss / (len(resid) - p - q))
+    return phi, np.full(q, theta), resid, resid_std
+
+
+def forecast_arima_differences(levels, forecast_days, p=AR_ORDER, q=MA_ORDER):
+    """
+    Forecast a series with an ARIMA(p,1,q) model: an ARMA(p,q) model of the
+    day-to-day differences, fitted by least squares
+    
+    Returns:
+    - forecast values, lower bounds and upper bounds (95% confidence) as arrays
+    - the fitted model parameters
+    """
+    diffs = np.diff(levels)
+    phi, theta, resid, resid_std = fit_arma_css(diffs, p, q)
+    
+    # Extend the differences with the ARMA recursion
+    diff_forecast = arma_forecast_kernel(
+        phi, theta, np.ascontiguousarray(diffs[len(diffs) - p:]),
+        np.ascontiguousarray(resid[len(resid) - q:]), forecast_days
+    )
+    forecast_values = levels[-1] + np.cumsum(diff_forecast)
+    
+    # Forecast error variance from the MA(infinity) weights of the differences,
+    # accumulated because the forecast is a sum of future differences.
+    # The weights follow the same recursion started from a unit shock.
+    unit_value = np.zeros(p)
+    unit_value[p - 1:] = 1.0
+    unit_shock = np.zeros(q)
+    unit_shock[q - 1:] = 1.0
+    psi = np.concatenate(([1.0], arma_forecast_kernel(phi, theta, unit_value, unit_shock, forecast_days - 1)))
+    forecast_std = resid_std * np.sqrt(np.cumsum(np.cumsum(psi) ** 2))
+    
+    lower_bounds = forecast_values - 1.96 * forecast_std
+    upper_bounds = forecast_values + 1.96 * forecast_std
+    
+    return forecast_values, lower_bounds, upper_bounds, {
+        'order': (p, 1, q), 'phi': phi, 'theta': theta, 'resid_std': resid_std
+    }
+
+
+def fit_arima_model(series):
+    """Fit an ARIMA model to a daily AQI series"""
+    # Try each order in turn, falling back to simpler models
+    for order in ARIMA_ORDERS[:-1]:
+        try:
+            return ARIMA(series, order=order).fit()
+        except Exception:
+            pass
+    
+    # Very simple model
+    return ARIMA(series, order=ARIMA_ORDERS[-1]).fit()
+
+
+def arima_model_key(series):
+    """
+    Cache key of the ARIMA model of a daily AQI series: a hash of the series,
+    the candidate orders and the statsmodels version that fits it
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f'{statsmodels.__version__}|{ARIMA_ORDERS}|'.encode())
+    hasher.update(series.index[0].isoformat().encode())
+    hasher.update(series.to_numpy(np.float64).tobytes())
+    return hasher.hexdigest()
+
+
+def get_arima_model(series):
+    """
+    Get a fitted ARIMA model for a daily AQI series
+    Models are cached in memory and on disk by arima_model_key, so a series
+    that has not changed is only fitted once. Only the order and parameters
+    are saved; loading runs the Kalman filter with them, which is much
+    faster than fitting and gives the same forecasts.
+    """
+    key = arima_model_key(series)
+    
+    fitted_model = _arima_model_cache.get(key)
+    if fitted_model is not None:
+        return fitted_model
+    
+    cache_path = os.path.join(MODEL_CACHE_FOLDER, f'arima_{key}.pkl')
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                saved = pickle.load(f)
+            fitted_model = ARIMA(series, order=saved['order']).filter(saved['params'])
+        except Exception as e:
+            logger.warning("Could not read cached model %s: %s", cache_path, e)
+    
+    if fitted_model is None:
+        fitted_model = fit_arima_model(series)
+        saved = {'order': fitted_model.model.order, 'params': fitted_model.params.to_numpy()}
+        try:
+            os.makedirs(MODEL_CACHE_FOLDER, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial pickle
+            tmp_path = f'{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(saved, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not write cached model %s: %s", cache_path, e)
+    
+    _arima_model_cache[key] = fitted_model
+    return fitted_model
+
+
+def prune_arima_models(keep_keys):
+    """Delete cached ARIMA models on disk whose key is not in keep_keys"""
+    try:
+        file_names = os.listdir(MODEL_CACHE_FOLDER)
+    except OSError:
+        return
+    
+    for file_name in file_names:
+        if not (file_name.startswith('arima_') and file_name.endswith('.pkl')):
+            continue
+        if file_name[len('arima_'):-len('.pkl')] in keep_keys:
+            continue
+        try:
+            os.remove(os.path.join(MODEL_CACHE_FOLDER, file_name))
+        except OSError as e:
+            logger.warning("Could not delete stale cached model %s: %s", file_name, e)
+
+
+def to_daily_series(df):
+    """
+    Daily AQI of a DataFrame with 'date' and 'aqi' columns, indexed by date
+    Multiple readings per day are averaged and missing days filled
+    """
+    df_ts = df[['date', 'aqi']]
+    df_ts = df_ts.set_index('date')
+    df_ts = df_ts.sort_index()
+    
+    # Resample to daily if needed (handle multiple readings per day)
+    if len(df_ts) > 0:
+        df_ts = df_ts.resample('D').mean()
+        df_ts = df_ts.ffill().bfill()
+    
+    return df_ts
+
+
+def precompute_arima_models(file_path):
+    """
+    Fit (or load from disk) the ARIMA model of every city ahead of the first
+    forecast request, then delete cached models that no longer match the data
+    """
+    if not (USE_ARIMA_LEGACY and ARIMA_AVAILABLE) or load_full_dataset(file_path) is None:
+        return
+    
+    current_keys = set()
+    for city, (dates, aqi_values) in list(DAILY_BY_CITY.items()):
+        try:
+            city_df = pd.DataFrame({'date': dates, 'aqi': aqi_values})
+            current_keys.add(arima_model_key(to_daily_series(city_df)['aqi']))
+            forecast_aqi_arima(city_df, 1)
+        except Exception as e:
+            logger.warning("Error precomputing ARIMA model for %s: %s", city or 'All Cities', e)
+    
+    prune_arima_models(current_keys)
+
+
 def forecast_aqi_arima(df, forecast_days=30):
     """
-    Forecast future AQI values using ARIMA model (if available)
-    Falls back to simple forecast if ARIMA is not available
+    Forecast future AQI values using an ARIMA(p,1,q) model fitted by least squares,
+    or the statsmodels ARIMA model if USE_ARIMA_LEGACY is set (and available)
+    Falls back to simple forecast if the model cannot be fitted
     
     Parameters:
     - df: DataFrame with 'date' and 'aqi' columns
@@ -321,39 +892,28 @@ def forecast_aqi_arima(df, forecast_days=30):
     - forecast: DataFrame with forecasted values
     """
     # Use simple forecast if ARIMA is not available
-    if not ARIMA_AVAILABLE:
+    if USE_ARIMA_LEGACY and not ARIMA_AVAILABLE:
         return forecast_aqi_simple(df, forecast_days)
     
     try:
         # Prepare time series data
-        df_ts = df[['date', 'aqi']].copy()
-        df_ts = df_ts.set_index('date')
-        df_ts = df_ts.sort_index()
-        
-        # Resample to daily if needed (handle multiple readings per day)
-        if len(df_ts) > 0:
-            df_ts = df_ts.resample('D').mean()
-            df_ts = df_ts.ffill().bfill()
-        
-        # Fit ARIMA model
-        # Auto-select order if possible, otherwise use (1,1,1)
-        try:
-            # Try to find optimal parameters
-            model = ARIMA(df_ts['aqi'], order=(1, 1, 1))
-            fitted_model = model.fit()
-        except:
-            # Fallback to simpler model
-            try:
-                model = ARIMA(df_ts['aqi'], order=(1, 0, 1))
-                fitted_model = model.fit()
-            except:
-                # Very simple model
-                model = ARIMA(df_ts['aqi'], order=(1, 0, 0))
-                fitted_model = model.fit()
+        df_ts = to_daily_series(df)
         
-        # Generate forecast
-        forecast = fitted_model.forecast(steps=forecast_days)
-        forecast_conf_int = fitted_model.get_forecast(steps=forecast_days).conf_int()
+        if USE_ARIMA_LEGACY:
+            # Fit ARIMA model (or reuse the one fitted on the same series)
+            fitted_model = get_arima_model(df_ts['aqi'])
+            
+            # Generate forecast
+            forecast = fitted_model.forecast(steps=forecast_days)
+            forecast_conf_int = fitted_model.get_forecast(steps=forecast_days).conf_int()
+            
+            forecast_values = forecast.values
+            lower_bounds = forecast_conf_int.iloc[:, 0].values
+            upper_bounds = forecast_conf_int.iloc[:, 1].values
+        else:
+            forecast_values, lower_bounds, upper_bounds, fitted_model = forecast_arima_differences(
+                df_ts['aqi'].to_numpy(np.float64), forecast_days
+            )
         
         # Create forecast dates
         last_date = df_ts.index[-1]
@@ -362,20 +922,65 @@ def forecast_aqi_arima(df, forecast_days=30):
         # Create forecast DataFrame
         forecast_df = pd.DataFrame({
             'date': forecast_dates,
-            'aqi': forecast.values,
-            'lower_bound': forecast_conf_int.iloc[:, 0].values,
-            'upper_bound': forecast_conf_int.iloc[:, 1].values
+            'aqi': forecast_values,
+            'lower_bound': lower_bounds,
+            'upper_bound': upper_bounds
         })
         
         return forecast_df, fitted_model
         
     except Exception as e:
-        print(f"Error in ARIMA forecasting: {str(e)}")
-        print("Falling back to simple forecast method...")
+        logger.warning("Error in ARIMA forecasting (%s), falling back to simple forecast method", e)
         # Fallback to simple forecast
         return forecast_aqi_simple(df, forecast_days)
 
 
+def format_dates(dates):
+    """Format an array of dates as 'YYYY-MM-DD' strings for JSON output"""
+    return np.datetime_as_string(np.asarray(dates, dtype='datetime64[D]'), unit='D').tolist()
+
+
+def to_json_compatible(obj):
+    """Convert numpy values the JSON encoder cannot serialize natively"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response(payload):
+    """Build a JSON response, serializing numpy arrays directly when orjson is available"""
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(payload, default=to_json_compatible, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(payload, default=to_json_compatible)
+    return app.response_class(body, mimetype='application/json')
+
+
+def wants_msgpack():
+    """Whether the client asked for a MessagePack response over JSON"""
+    if not MSGPACK_AVAILABLE:
+        return False
+    best = request.accept_mimetypes.best_match(['application/json', 'application/msgpack'])
+    return best == 'application/msgpack'
+
+
+def pack_dates(dates):
+    """Dates as little-endian int32 days since 1970-01-01"""
+    return np.asarray(dates, dtype='datetime64[D]').view(np.int64).astype('<i4').tobytes()
+
+
+def pack_values(values):
+    """Values as little-endian float32"""
+    return np.asarray(values, dtype='<f4').tobytes()
+
+
+def msgpack_response(payload):
+    """Build a MessagePack response"""
+    return app.response_class(msgpack.packb(payload, use_bin_type=True), mimetype='application/msgpack')
+
+
 @app.route('/')
 def index():
     """Main page route"""
@@ -388,18 +993,15 @@ def get_cities():
     try:
         df = load_full_dataset(DATA_FILE)
         if df is None:
-            return jsonify({'error': 'Failed to load data'}), 500
+            return json_response({'error': 'Failed to load data'}), 500
         
-        if 'city' in df.columns:
-            cities = sorted(df['city'].unique().tolist())
-            cities = [c for c in cities if pd.notna(c) and str(c).strip() != '']
-        else:
-            cities = ['All Cities']
+        cities = sorted(df.index.levels[0].tolist())
+        cities = [c for c in cities if pd.notna(c) and str(c).strip() != '']
         
-        return jsonify({'cities': cities})
+        return json_response({'cities': cities})
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 
 @app.route('/api/load-data', methods=['POST'])
@@ -408,7 +1010,7 @@ def load_data():
     try:
         # Check if data file exists
         if not os.path.exists(DATA_FILE):
-            return jsonify({'error': f'Data file not found. Please ensure {DATA_FILE} exists in the data folder.'}), 404
+            return json_response({'error': f'Data file not found. Please ensure {DATA_FILE} exists in the data folder.'}), 404
         
         # Get city from request (optional)
         data = request.get_json() or {}
@@ -419,7 +1021,7 @@ def load_data():
         
         if df is None or len(df) == 0:
             city_msg = f" for city '{city}'" if city else ""
-            return jsonify({'error': f'Failed to load or preprocess data{city_msg}.'}), 500
+            return json_response({'error': f'Failed to load or preprocess data{city_msg}.'}), 500
         
         # Calculate statistics
         stats = {
@@ -438,14 +1040,14 @@ def load_data():
         }
         
         city_msg = f" for {city}" if city else ""
-        return jsonify({
+        return json_response({
             'success': True,
             'stats': stats,
             'message': f'Successfully loaded {len(df)} records{city_msg}'
         })
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 
 @app.route('/api/daily-trend', methods=['GET'])
@@ -455,23 +1057,23 @@ def daily_trend():
         # Get city from query parameters
         city = request.args.get('city', None)
         
-        df = load_and_preprocess_data(DATA_FILE, city=city)
-        if df is None:
-            return jsonify({'error': 'Failed to load data'}), 500
+        daily = get_daily_aqi(DATA_FILE, city=city)
+        if daily is None:
+            return json_response({'error': 'Failed to load data'}), 500
         
-        daily_df = calculate_daily_aqi(df)
+        dates, aqi_values = daily
         
         # Convert to JSON format for frontend
         data = {
             'city': city if city else 'All Cities',
-            'dates': daily_df['date'].dt.strftime('%Y-%m-%d').tolist(),
-            'aqi_values': daily_df['aqi'].tolist()
+            'dates': format_dates(dates),
+            'aqi_values': aqi_values
         }
         
-        return jsonify(data)
+        return json_response(data)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 
 @app.route('/api/monthly-trend', methods=['GET'])
@@ -481,23 +1083,23 @@ def monthly_trend():
         # Get city from query parameters
         city = request.args.get('city', None)
         
-        df = load_and_preprocess_data(DATA_FILE, city=city)
-        if df is None:
-            return jsonify({'error': 'Failed to load data'}), 500
+        monthly = get_monthly_aqi(DATA_FILE, city=city)
+        if monthly is None:
+            return json_response({'error': 'Failed to load data'}), 500
         
-        monthly_df = calculate_monthly_aqi(df)
+        dates, aqi_values = monthly
         
         # Convert to JSON format for frontend
         data = {
             'city': city if city else 'All Cities',
-            'dates': monthly_df['date'].dt.strftime('%Y-%m-%d').tolist(),
-            'aqi_values': monthly_df['aqi'].tolist()
+            'dates': format_dates(dates),
+            'aqi_values': aqi_values
         }
         
-        return jsonify(data)
+        return json_response(data)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 
 @app.route('/api/forecast', methods=['POST'])
@@ -506,26 +1108,53 @@ def forecast():
     try:
         # Get forecast days and city from request
         data = request.get_json() or {}
-        forecast_days = data.get('days', 30)
         city = data.get('city', None)
         
-        # Load and preprocess data
-        df = load_and_preprocess_data(DATA_FILE, city=city)
-        if df is None:
-            return jsonify({'error': 'Failed to load data'}), 500
-        
-        # Calculate daily AQI for forecasting
-        daily_df = calculate_daily_aqi(df)
+        # Validate here: the compiled forecast kernels need a positive integer
+        days = data.get('days', 30)
+        try:
+            # int() would accept booleans and truncate fractional values
+            if isinstance(days, bool) or (isinstance(days, float) and not days.is_integer()):
+                raise ValueError(f"invalid days: {days!r}")
+            forecast_days = int(days)
+        except (TypeError, ValueError, OverflowError):
+            return json_response({'error': 'days must be an integer'}), 400
+        if not 1 <= forecast_days <= MAX_FORECAST_DAYS:
+            return json_response({'error': f'days must be between 1 and {MAX_FORECAST_DAYS}'}), 400
+        
+        # Load daily AQI for forecasting
+        daily = get_daily_aqi(DATA_FILE, city=city)
+        if daily is None:
+            return json_response({'error': 'Failed to load data'}), 500
+        
+        daily_df = pd.DataFrame({'date': daily[0], 'aqi': daily[1]})
         
         # Generate forecast
         forecast_df, model = forecast_aqi_arima(daily_df, forecast_days)
         
         if forecast_df is None:
-            return jsonify({'error': 'Failed to generate forecast'}), 500
+            return json_response({'error': 'Failed to generate forecast'}), 500
+        
+        # Binary response for clients that accept it: the arrays are sent as raw
+        # int32 day numbers and float32 values instead of JSON text
+        if wants_msgpack():
+            return msgpack_response({
+                'city': city if city else 'All Cities',
+                'historical': {
+                    'dates': pack_dates(daily_df['date'].values),
+                    'aqi_values': pack_values(daily_df['aqi'].values)
+                },
+                'forecast': {
+                    'dates': pack_dates(forecast_df['date'].values),
+                    'aqi_values': pack_values(forecast_df['aqi'].values),
+                    'lower_bound': pack_values(forecast_df['lower_bound'].values),
+                    'upper_bound': pack_values(forecast_df['upper_bound'].values)
+                }
+            })
         
         # Get historical data for plotting
-        historical_dates = daily_df['date'].dt.strftime('%Y-%m-%d').tolist()
-        historical_aqi = daily_df['aqi'].tolist()
+        historical_dates = format_dates(daily_df['date'].values)
+        historical_aqi = daily_df['aqi'].to_numpy()
         
         # Prepare forecast data
         forecast_data = {
@@ -535,24 +1164,78 @@ def forecast():
                 'aqi_values': historical_aqi
             },
             'forecast': {
-                'dates': forecast_df['date'].dt.strftime('%Y-%m-%d').tolist(),
-                'aqi_values': forecast_df['aqi'].tolist(),
-                'lower_bound': forecast_df['lower_bound'].tolist(),
-                'upper_bound': forecast_df['upper_bound'].tolist()
+                'dates': format_dates(forecast_df['date'].values),
+                'aqi_values': forecast_df['aqi'].to_numpy(),
+                'lower_bound': forecast_df['lower_bound'].to_numpy(),
+                'upper_bound': forecast_df['upper_bound'].to_numpy()
             }
         }
         
-        return jsonify(forecast_data)
+        return json_response(forecast_data)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
+
+
+def warm_up():
+    """
+    Compile the Numba kernels and fit the forecasting models ahead of the
+    first forecast request, which otherwise pays for both
+    """
+    try:
+        # Same argument types as the real calls, so the compiled versions are reused
+        linear_trend_slope(np.arange(30, dtype=np.float64))
+        simple_forecast_kernel(100.0, 0.1, 10.0, np.full(367, 100.0), np.arange(1, 31, dtype=np.int64))
+        ma_filter_kernel(np.arange(30, dtype=np.float64), 0.5)
+        arma_forecast_kernel(np.array([0.5]), np.array([-0.3]), np.array([100.0]), np.array([1.0]), 30)
+    except Exception:
+        logger.exception("Error compiling forecasting kernels")
+    
+    precompute_arima_models(DATA_FILE)
+
+
+def wait_for_warm_up():
+    """
+    Let the warm-up thread finish before the process forks (gunicorn --preload),
+    so workers inherit its results and no lock is held by a thread that
+    does not exist in the child
+    """
+    thread = _warm_up_thread
+    if thread is not None and thread is not threading.current_thread():
+        thread.join()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=wait_for_warm_up)
+
+
+def init_app():
+    """
+    Load the dataset and build the cached aggregates at import time, so a
+    preloading WSGI server (gunicorn --preload) shares them between workers.
+    Kernel compilation and model fitting continue in a background thread.
+    """
+    global _warm_up_thread
+    
+    if not os.path.exists(DATA_FILE):
+        logger.warning("Data file not found: %s", DATA_FILE)
+        return
+    
+    if load_full_dataset(DATA_FILE) is None:
+        return
+    
+    _warm_up_thread = threading.Thread(target=warm_up, daemon=True)
+    _warm_up_thread.start()
+
+
+init_app()
 
 
 if __name__ == '__main__':
-    # Run the Flask application
+    # Run the Flask development server (use a WSGI server such as gunicorn in production)
     print("Starting Air Pollution Analysis and Forecasting System...")
     print(f"Data file location: {DATA_FILE}")
     print("Using Kaggle city_day.csv dataset")
     print("Supported cities: Delhi, Chennai, Mumbai, and more...")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=False, host='0.0.0.0', port=5000)
 
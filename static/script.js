@@ -291,6 +291,42 @@ async function loadMonthlyTrend() {
     }
 }
 
+// Decode little-endian float32 values from MessagePack binary data
+function unpackValues(bytes) {
+    // Copy so the buffer is 4-byte aligned for the typed array
+    return Array.from(new Float32Array(bytes.slice().buffer));
+}
+
+// Decode int32 days since 1970-01-01 from MessagePack binary data as 'YYYY-MM-DD' strings
+function unpackDates(bytes) {
+    return Array.from(new Int32Array(bytes.slice().buffer), days =>
+        new Date(days * 86400000).toISOString().slice(0, 10)
+    );
+}
+
+// Read a forecast response, decoding the binary MessagePack format if the server sent it
+async function readForecastResponse(response) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!contentType.includes('application/msgpack')) {
+        return await response.json();
+    }
+    
+    const data = MessagePack.decode(new Uint8Array(await response.arrayBuffer()));
+    return {
+        city: data.city,
+        historical: {
+            dates: unpackDates(data.historical.dates),
+            aqi_values: unpackValues(data.historical.aqi_values)
+        },
+        forecast: {
+            dates: unpackDates(data.forecast.dates),
+            aqi_values: unpackValues(data.forecast.aqi_values),
+            lower_bound: unpackValues(data.forecast.lower_bound),
+            upper_bound: unpackValues(data.forecast.upper_bound)
+        }
+    };
+}
+
 // Generate and display forecast
 async function generateForecast() {
     const statusDiv = document.getElementById('forecast-status');
@@ -302,15 +338,21 @@ async function generateForecast() {
     statusDiv.style.display = 'block';
     
     try {
+        // Ask for the compact binary format if the MessagePack library loaded
+        const accept = typeof MessagePack !== 'undefined'
+            ? 'application/msgpack, application/json;q=0.9'
+            : 'application/json';
+        
         const response = await fetch('/api/forecast', {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Accept': accept
             },
             body: JSON.stringify({ days: forecastDays, city: city || null })
         });
         
-        const data = await response.json();
+        const data = await readForecastResponse(response);
         
         if (data.error) {
             statusDiv.className = 'status-message error';